@@ -9,28 +9,46 @@
 - GET /v1/videos/{video_id}/content - 获取视频内容
 """
 
+import re
 import base64
-from typing import Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, Request
-from fastapi.responses import FileResponse
-from pydantic import ValidationError
+import asyncio
+import orjson
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from starlette.datastructures import UploadFile
 
 from app.core.auth import auth_manager
+from app.core.fs import run_fs
 from app.core.logger import logger
+from app.core.response import SendfileResponse
+from app.core.task_cache import task_cache
 from app.models.video_schema import (
+    MAX_INPUT_REFERENCE_LENGTH,
     CreateVideoRequest,
     RemixVideoRequest,
     VideoJob,
     VideoListResponse,
     VideoDeleteResponse,
-    VideoStatus,
     VideoError
 )
+from app.services.grok.cache import video_cache_service
 from app.services.video_task import video_task_service
 
 
 router = APIRouter(prefix="/videos", tags=["视频"])
 
+# 预编译序列化器
+_JOB_ADAPTER = TypeAdapter(VideoJob)
+
+# 同一任务的并发查询合并为一次，结果在窗口期内复用
+_INFLIGHT: Dict[str, asyncio.Task] = {}
+_COALESCE_WINDOW = 0.2
+
+# 单区间Range请求头
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 def _build_error_response(status_code: int, message: str, error_type: str = "invalid_request_error") -> Dict[str, Any]:
     """构建错误响应"""
@@ -43,6 +61,99 @@ def _build_error_response(status_code: int, message: str, error_type: str = "inv
     }
 
 
+def _parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """解析单区间Range请求头
+
+    Returns:
+        闭区间 (start, end)；无Range、格式不支持或区间无效（末位置小于起始位置）
+        时返回 None（按完整文件响应）
+    """
+    if not range_header:
+        return None
+
+    match = _RANGE_RE.match(range_header.strip())
+    if not match:
+        return None
+
+    start_str, end_str = match.groups()
+    if not start_str and not end_str:
+        return None
+
+    if not start_str:
+        # 后缀区间: bytes=-N
+        start = max(size - int(end_str), 0)
+        end = size - 1
+    else:
+        start = int(start_str)
+        if end_str and int(end_str) < start:
+            # RFC 9110：末位置小于起始位置的区间无效，忽略Range
+            return None
+        end = min(int(end_str), size - 1) if end_str else size - 1
+
+    return start, end
+
+
+def _to_video_job(task) -> VideoJob:
+    """任务转换为VideoJob（数据由内部生成，跳过字段校验）"""
+    data = task.to_openai_response()
+    if data["error"]:
+        # 响应字典可能是任务上的缓存，复制后再替换
+        data = {**data, "error": VideoError.model_construct(**data["error"])}
+    return VideoJob.model_construct(**data)
+
+
+def _job_response(task) -> Response:
+    """任务直接序列化为JSON响应"""
+    return Response(content=_JOB_ADAPTER.dump_json(_to_video_job(task)), media_type="application/json")
+
+
+async def _stream_list(
+    dicts: List[Dict[str, Any]],
+    has_more: bool,
+    first_id: Optional[str],
+    last_id: Optional[str]
+) -> AsyncIterator[bytes]:
+    """逐条输出列表JSON，峰值内存只占单个任务"""
+    yield b'{"object":"list","data":['
+    for i, d in enumerate(dicts):
+        yield (b"," if i else b"") + orjson.dumps(d)
+    yield b'],"has_more":' + orjson.dumps(has_more) + b',"first_id":' + orjson.dumps(first_id) + b',"last_id":' + orjson.dumps(last_id) + b'}'
+
+
+async def _fetch_job_json(video_id: str) -> Optional[bytes]:
+    """读取任务JSON（优先缓存，未命中时序列化并回填）"""
+    cached = await task_cache.get(video_id)
+    if cached:
+        return cached
+
+    task = await video_task_service.get_task(video_id)
+    if not task:
+        return None
+
+    content = _JOB_ADAPTER.dump_json(_to_video_job(task))
+    # 序列化期间任务可能已被删除，避免回填已删除的任务
+    if await video_task_service.get_task(video_id) is task:
+        await task_cache.put(video_id, content)
+    return content
+
+
+async def _get_job_json(video_id: str) -> Optional[bytes]:
+    """合并同一任务的并发查询"""
+    fetch = _INFLIGHT.get(video_id)
+    if fetch is None:
+        fetch = asyncio.create_task(_fetch_job_json(video_id))
+        _INFLIGHT[video_id] = fetch
+        loop = asyncio.get_running_loop()
+        fetch.add_done_callback(lambda t: loop.call_later(_COALESCE_WINDOW, _release_inflight, video_id, t))
+    return await asyncio.shield(fetch)
+
+
+def _release_inflight(video_id: str, fetch: asyncio.Task) -> None:
+    """窗口期结束后移除已完成的查询"""
+    if _INFLIGHT.get(video_id) is fetch:
+        del _INFLIGHT[video_id]
+
+
 async def _parse_create_video_request(raw_request: Request) -> CreateVideoRequest:
     """根据内容类型解析创建视频请求"""
     content_type = raw_request.headers.get("content-type", "").lower()
@@ -60,11 +171,19 @@ async def _parse_create_video_request(raw_request: Request) -> CreateVideoReques
             input_reference: Optional[str] = None
 
             if isinstance(input_reference_value, UploadFile):
+                # 编码前按文件大小拒绝超限上传，避免读入整个文件
+                if input_reference_value.size and input_reference_value.size > MAX_INPUT_REFERENCE_LENGTH // 4 * 3:
+                    await input_reference_value.close()
+                    raise HTTPException(
+                        status_code=400,
+                        detail=_build_error_response(400, "参考图片过大", "invalid_request_error")
+                    )
+
                 file_bytes = await input_reference_value.read()
                 await input_reference_value.close()
                 if file_bytes:
                     mime = input_reference_value.content_type or "application/octet-stream"
-                    encoded = base64.b64encode(file_bytes).decode("ascii")
+                    encoded = (await asyncio.to_thread(base64.b64encode, file_bytes)).decode("ascii")
                     input_reference = f"data:{mime};base64,{encoded}"
             elif input_reference_value not in (None, ""):
                 input_reference = str(input_reference_value)
@@ -81,6 +200,8 @@ async def _parse_create_video_request(raw_request: Request) -> CreateVideoReques
 
         return CreateVideoRequest(**data)
 
+    except HTTPException:
+        raise
     except ValidationError as exc:
         logger.warning(f"[VideoAPI] 请求体验证失败: {exc.errors()}")
         raise HTTPException(
@@ -95,12 +216,13 @@ async def _parse_create_video_request(raw_request: Request) -> CreateVideoReques
         ) from exc
 
 
-@router.post("", response_model=VideoJob)
-@router.post("/", response_model=VideoJob, include_in_schema=False)
+@router.post("", response_model=None, responses={200: {"model": VideoJob}})
+@router.post("/", response_model=None, include_in_schema=False)
+@router.post("/generations", response_model=None, include_in_schema=False)
 async def create_video(
     raw_request: Request,
     _: Optional[str] = Depends(auth_manager.verify)
-) -> VideoJob:
+) -> Response:
     """创建视频生成任务
     
     创建一个新的视频生成任务。任务将在后台异步执行，
@@ -113,16 +235,18 @@ async def create_video(
         创建的视频任务对象
     """
     try:
-        # 打印完整请求体用于调试
-        try:
-            body = await raw_request.body()
-            logger.info(f"[VideoAPI] 原始请求体: {body.decode('utf-8', errors='replace')[:2000]}")
-        except Exception as e:
-            logger.warning(f"[VideoAPI] 读取请求体失败: {e}")
+        # 仅在调试级别读取并打印请求体（截断）
+        if logger.is_debug():
+            try:
+                body = await raw_request.body()
+                logger.debug(f"[VideoAPI] 原始请求体(截断): {body[:2048].decode('utf-8', errors='replace')}")
+            except Exception as e:
+                logger.warning(f"[VideoAPI] 读取请求体失败: {e}")
 
         request = await _parse_create_video_request(raw_request)
         
-        logger.info(f"[VideoAPI] 解析后请求: {request.model_dump()}")
+        if logger.is_debug():
+            logger.debug(f"[VideoAPI] 解析后请求: {request.model_dump()}")
         logger.info(f"[VideoAPI] 创建视频任务: model={request.model}, prompt={request.prompt[:50]}...")
         
         # 创建任务
@@ -136,8 +260,10 @@ async def create_video(
         )
         
         # 转换为OpenAI格式响应
-        return VideoJob(**task.to_openai_response())
+        return _job_response(task)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[VideoAPI] 创建任务失败: {e}")
         raise HTTPException(
@@ -146,23 +272,14 @@ async def create_video(
         )
 
 
-@router.post("/generations", response_model=VideoJob, include_in_schema=False)
-async def create_video_generations(
-    raw_request: Request,
-    _: Optional[str] = Depends(auth_manager.verify)
-) -> VideoJob:
-    """创建视频生成任务（兼容 /generations 路径）"""
-    return await create_video(raw_request, _)
-
-
-@router.get("", response_model=VideoListResponse)
-@router.get("/", response_model=VideoListResponse, include_in_schema=False)
+@router.get("", response_model=None, responses={200: {"model": VideoListResponse}})
+@router.get("/", response_model=None, include_in_schema=False)
 async def list_videos(
     after: Optional[str] = Query(default=None, description="分页游标"),
     limit: int = Query(default=20, ge=1, le=100, description="返回数量"),
     order: str = Query(default="desc", description="排序方式 asc/desc"),
     _: Optional[str] = Depends(auth_manager.verify)
-) -> VideoListResponse:
+) -> Response:
     """列出视频任务
     
     获取当前项目最近生成的视频任务列表。
@@ -178,17 +295,15 @@ async def list_videos(
     try:
         logger.debug(f"[VideoAPI] 列出视频任务: limit={limit}, order={order}")
         
-        tasks, has_more, first_id, last_id = await video_task_service.list_tasks(
+        dicts, has_more, first_id, last_id = await video_task_service.list_openai_dicts(
             limit=limit,
             after=after,
             order=order
         )
         
-        return VideoListResponse(
-            data=[VideoJob(**t.to_openai_response()) for t in tasks],
-            has_more=has_more,
-            first_id=first_id,
-            last_id=last_id
+        return StreamingResponse(
+            _stream_list(dicts, has_more, first_id, last_id),
+            media_type="application/json"
         )
         
     except Exception as e:
@@ -199,11 +314,11 @@ async def list_videos(
         )
 
 
-@router.get("/{video_id}", response_model=VideoJob)
+@router.get("/{video_id}", response_model=None, responses={200: {"model": VideoJob}})
 async def get_video(
     video_id: str,
     _: Optional[str] = Depends(auth_manager.verify)
-) -> VideoJob:
+) -> Response:
     """获取视频任务状态
     
     获取指定视频任务的最新元数据。
@@ -217,14 +332,14 @@ async def get_video(
     try:
         logger.debug(f"[VideoAPI] 获取视频任务: {video_id}")
         
-        task = await video_task_service.get_task(video_id)
-        if not task:
+        content = await _get_job_json(video_id)
+        if not content:
             raise HTTPException(
                 status_code=404,
                 detail=_build_error_response(404, f"视频任务不存在: {video_id}", "not_found")
             )
         
-        return VideoJob(**task.to_openai_response())
+        return Response(content=content, media_type="application/json")
         
     except HTTPException:
         raise
@@ -239,6 +354,7 @@ async def get_video(
 @router.delete("/{video_id}", response_model=VideoDeleteResponse)
 async def delete_video(
     video_id: str,
+    background: BackgroundTasks,
     _: Optional[str] = Depends(auth_manager.verify)
 ) -> VideoDeleteResponse:
     """删除视频任务
@@ -254,13 +370,20 @@ async def delete_video(
     try:
         logger.info(f"[VideoAPI] 删除视频任务: {video_id}")
         
-        task = await video_task_service.delete_task(video_id)
+        task = await video_task_service.mark_deleted(video_id)
+        fetch = _INFLIGHT.pop(video_id, None)
+        if fetch is not None and not fetch.done():
+            # 等待进行中的查询结束后再次失效缓存，防止其回填已删除的任务
+            await asyncio.wait([fetch])
+            await task_cache.delete(video_id)
         if not task:
             raise HTTPException(
                 status_code=404,
                 detail=_build_error_response(404, f"视频任务不存在: {video_id}", "not_found")
             )
         
+        # 响应返回后再清理存储资源
+        background.add_task(video_task_service.purge_assets, task)
         return VideoDeleteResponse(id=video_id, deleted=True)
         
     except HTTPException:
@@ -273,12 +396,12 @@ async def delete_video(
         )
 
 
-@router.post("/{video_id}/remix", response_model=VideoJob)
+@router.post("/{video_id}/remix", response_model=None, responses={200: {"model": VideoJob}})
 async def remix_video(
     video_id: str,
     request: RemixVideoRequest,
     _: Optional[str] = Depends(auth_manager.verify)
-) -> VideoJob:
+) -> Response:
     """混剪视频
     
     基于一个已完成的视频创建混剪版本。
@@ -315,7 +438,7 @@ async def remix_video(
                 detail=_build_error_response(500, "创建混剪任务失败", "internal_error")
             )
         
-        return VideoJob(**task.to_openai_response())
+        return _job_response(task)
         
     except HTTPException:
         raise
@@ -330,6 +453,7 @@ async def remix_video(
 @router.get("/{video_id}/content")
 async def get_video_content(
     video_id: str,
+    raw_request: Request,
     variant: str = Query(default="mp4", description="下载格式"),
     _: Optional[str] = Depends(auth_manager.verify)
 ):
@@ -364,9 +488,24 @@ async def get_video_content(
         # 获取视频文件
         video_path = await video_task_service.get_video_content(video_id)
         if not video_path:
-            # 如果本地没有缓存，重定向到远程URL
+            # 本地没有缓存时由服务端拉取远程视频，同时回填缓存
+            if source := video_task_service.get_remote_source(task):
+                url, cache_key = source
+                auth_token = video_task_service.get_remote_auth(task)
+                stream = await video_cache_service.stream_remote(url, cache_key, auth_token) if auth_token else None
+                if stream:
+                    body, content_length = stream
+                    headers = {
+                        "Cache-Control": "public, max-age=86400",
+                        "Access-Control-Allow-Origin": "*",
+                        "Content-Disposition": f'attachment; filename="{video_id}.mp4"'
+                    }
+                    if content_length:
+                        headers["Content-Length"] = content_length
+                    return StreamingResponse(body, media_type="video/mp4", headers=headers)
+
+            # 无法代理时重定向到远程URL
             if task.video_url:
-                from fastapi.responses import RedirectResponse
                 return RedirectResponse(url=task.video_url, status_code=302)
             
             raise HTTPException(
@@ -374,15 +513,45 @@ async def get_video_content(
                 detail=_build_error_response(404, "视频内容不可用", "not_found")
             )
         
+        # 文件系统调用放入线程池，限制并发避免占满线程池
+        st = await run_fs(video_path.stat)
+        etag = f'W/"{st.st_size:x}-{st.st_mtime_ns:x}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=86400",
+            "Access-Control-Allow-Origin": "*"
+        }
+
+        # 协商缓存命中，不传输内容
+        if_none_match = raw_request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+            return Response(status_code=304, headers=headers)
+
+        # 分段请求，只下发请求区间
+        byte_range = _parse_range(raw_request.headers.get("range"), st.st_size)
+        if byte_range:
+            start, end = byte_range
+            if start >= st.st_size:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{st.st_size}"})
+
+            return SendfileResponse(
+                video_path,
+                status_code=206,
+                media_type="video/mp4",
+                filename=f"{video_id}.mp4",
+                stat_result=st,
+                offset=start,
+                length=end - start + 1,
+                headers={**headers, "Content-Range": f"bytes {start}-{end}/{st.st_size}"}
+            )
+
         # 返回视频文件
-        return FileResponse(
-            path=str(video_path),
+        return SendfileResponse(
+            video_path,
             media_type="video/mp4",
             filename=f"{video_id}.mp4",
-            headers={
-                "Cache-Control": "public, max-age=86400",
-                "Access-Control-Allow-Origin": "*"
-            }
+            stat_result=st,
+            headers=headers
         )
         
     except HTTPException:
@@ -37,6 +37,8 @@ DEFAULT_GLOBAL = {
     "video_cache_max_size_mb": 1024,
     "max_upload_concurrency": 20,  # 最大并发上传数
     "max_request_concurrency": 50,  # 最大并发请求数
+    "max_fs_concurrency": 32,  # 视频文件系统调用最大并发数
+    "thread_pool_workers": 64,  # 默认线程池大小（asyncio.to_thread 阻塞调用）
     "batch_save_interval": 1.0,  # 批量保存间隔（秒）
     "batch_save_threshold": 10,  # 触发批量保存的变更数阈值
     "log_max_count": 10000,  # 调用日志最大数量
@@ -1,7 +1,7 @@
 """异常处理器 - OpenAI兼容的错误响应"""
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -68,18 +68,22 @@ def build_error_response(message: str, error_type: str, code: str = None, param:
     return {"error": error}
 
 
-async def http_exception_handler(_: Request, exc: StarletteHTTPException) -> JSONResponse:
+async def http_exception_handler(_: Request, exc: StarletteHTTPException) -> ORJSONResponse:
     """处理HTTP异常"""
+    # 已是OpenAI错误结构的detail直接返回，避免再次包装
+    if isinstance(exc.detail, dict) and isinstance(exc.detail.get("error"), dict):
+        return ORJSONResponse(status_code=exc.status_code, content=exc.detail, headers=exc.headers)
+
     error_type, default_msg = HTTP_ERROR_MAP.get(exc.status_code, ("api_error", str(exc.detail)))
     message = str(exc.detail) if exc.detail else default_msg
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=build_error_response(message, error_type)
     )
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
     """处理验证错误"""
     from app.core.logger import logger
     
@@ -97,26 +101,26 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     param = errors[0]["loc"][-1] if errors and errors[0].get("loc") else None
     message = errors[0]["msg"] if errors and errors[0].get("msg") else "请求参数错误"
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content=build_error_response(message, "invalid_request_error", param=param)
     )
 
 
-async def grok_api_exception_handler(_: Request, exc: GrokApiException) -> JSONResponse:
+async def grok_api_exception_handler(_: Request, exc: GrokApiException) -> ORJSONResponse:
     """处理Grok API异常"""
     http_status = GROK_STATUS_MAP.get(exc.error_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
     error_type = GROK_TYPE_MAP.get(exc.error_code, "api_error")
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=http_status,
         content=build_error_response(exc.message, error_type, exc.error_code)
     )
 
 
-async def global_exception_handler(_: Request, exc: Exception) -> JSONResponse:
+async def global_exception_handler(_: Request, exc: Exception) -> ORJSONResponse:
     """处理未捕获异常"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=build_error_response("服务器遇到意外错误，请重试", "api_error")
     )
@@ -0,0 +1,31 @@
+"""文件系统调用 - 在线程池中执行阻塞的文件操作并限制并发"""
+
+import asyncio
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import setting
+from app.core.logger import logger
+
+
+# 常量
+DEFAULT_FS_CONCURRENCY = 32
+
+T = TypeVar("T")
+
+_fs_sem: Optional[asyncio.Semaphore] = None
+
+
+def _get_fs_semaphore() -> asyncio.Semaphore:
+    """获取文件系统调用信号量（动态配置）"""
+    global _fs_sem
+    if _fs_sem is None:
+        max_concurrency = setting.global_config.get("max_fs_concurrency", DEFAULT_FS_CONCURRENCY)
+        _fs_sem = asyncio.Semaphore(max_concurrency)
+        logger.debug(f"[FS] 初始化文件系统调用并发限制: {max_concurrency}")
+    return _fs_sem
+
+
+async def run_fs(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """在线程池中执行文件系统调用，并发数受 max_fs_concurrency 限制，避免占满线程池"""
+    async with _get_fs_semaphore():
+        return await asyncio.to_thread(func, *args, **kwargs)
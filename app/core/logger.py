@@ -105,6 +105,10 @@ class LoggerManager:
         for name, level in config.items():
             logging.getLogger(name).setLevel(level)
 
+    def is_debug(self) -> bool:
+        """是否输出调试日志"""
+        return self.logger.isEnabledFor(logging.DEBUG)
+
     def debug(self, msg: str) -> None:
         """调试日志"""
         self.logger.debug(msg)
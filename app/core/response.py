@@ -0,0 +1,96 @@
+"""响应模块 - 大文件零拷贝下发"""
+
+import os
+from email.utils import formatdate
+from typing import Mapping, Optional
+from urllib.parse import quote
+
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.fs import run_fs
+
+
+class SendfileResponse(Response):
+    """文件响应 - 优先使用ASGI零拷贝扩展下发
+
+    服务器声明 ``http.response.zerocopysend`` 时直接交出文件描述符，
+    由服务器调用 sendfile(2) 将页缓存写入socket；声明 ``http.response.pathsend``
+    时交出路径；否则在线程中以大块 pread 读取后发送，避免逐块阻塞事件循环。
+    通过 ``offset``/``length`` 只下发文件的一个区间（用于206分段响应）。
+    """
+
+    chunk_size = 1 << 20
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+        filename: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = background
+        self.stat_result = stat_result if stat_result is not None else os.stat(path)
+        self.offset = offset
+        self.length = self.stat_result.st_size - offset if length is None else length
+        self.init_headers(headers)
+
+        self.headers.setdefault("content-length", str(self.length))
+        self.headers.setdefault("last-modified", formatdate(self.stat_result.st_mtime, usegmt=True))
+        self.headers.setdefault("accept-ranges", "bytes")
+        if filename is not None:
+            quoted = quote(filename)
+            if quoted != filename:
+                self.headers.setdefault("content-disposition", f"attachment; filename*=utf-8''{quoted}")
+            else:
+                self.headers.setdefault("content-disposition", f'attachment; filename="{filename}"')
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        offset, count = self.offset, self.length
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+
+        if scope["method"].upper() == "HEAD" or count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": offset,
+                    "count": count,
+                    "more_body": False
+                })
+        elif "http.response.pathsend" in extensions and count == self.stat_result.st_size:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            await self._send_chunks(send, offset, count)
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_chunks(self, send: Send, offset: int, count: int) -> None:
+        """回退路径：线程内 pread 读取大块后发送"""
+        fd = await run_fs(os.open, self.path, os.O_RDONLY)
+        try:
+            end = offset + count
+            while offset < end:
+                chunk = await run_fs(os.pread, fd, min(self.chunk_size, end - offset), offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": offset < end})
+            if offset < end:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            os.close(fd)
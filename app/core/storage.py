@@ -339,6 +339,11 @@ class RedisStorage(BaseStorage):
         self._redis = None
         self._file = FileStorage(data_dir)
 
+    @property
+    def client(self):
+        """Redis客户端（供缓存等模块复用连接池）"""
+        return self._redis
+
     async def init_db(self) -> None:
         """初始化Redis"""
         try:
@@ -0,0 +1,58 @@
+"""视频任务缓存 - Redis模式下的任务响应读穿缓存"""
+
+from typing import Any, Optional
+
+from app.core.logger import logger
+
+
+# 常量
+KEY_PREFIX = "vjob:"
+DEFAULT_TTL = 5  # 秒，轮询场景下保持最终一致
+
+
+class TaskCache:
+    """视频任务响应缓存（多worker共享）
+
+    仅在 Redis 存储模式下生效，缓存已序列化的 VideoJob JSON，
+    未配置 Redis 时所有操作为空操作。
+    """
+
+    def __init__(self):
+        self._redis = None
+
+    def set_storage(self, storage: Any) -> None:
+        """设置存储实例（复用Redis存储的连接池）"""
+        self._redis = getattr(storage, "client", None)
+
+    async def get(self, video_id: str) -> Optional[bytes]:
+        """读取缓存的任务JSON"""
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(f"{KEY_PREFIX}{video_id}")
+            return data.encode() if isinstance(data, str) else data
+        except Exception as e:
+            logger.warning(f"[TaskCache] 读取失败: {e}")
+            return None
+
+    async def put(self, video_id: str, content: bytes, ttl: int = DEFAULT_TTL) -> None:
+        """写入任务JSON"""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(f"{KEY_PREFIX}{video_id}", content, ex=ttl)
+        except Exception as e:
+            logger.warning(f"[TaskCache] 写入失败: {e}")
+
+    async def delete(self, video_id: str) -> None:
+        """失效任务缓存"""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(f"{KEY_PREFIX}{video_id}")
+        except Exception as e:
+            logger.warning(f"[TaskCache] 删除失败: {e}")
+
+
+# 全局实例
+task_cache = TaskCache()
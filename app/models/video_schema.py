@@ -1,59 +1,71 @@
 """OpenAI Video API 请求-响应模型定义"""
 
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
-from enum import Enum
+from typing import Optional, List, Dict, Any, Literal, Annotated
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 
 
-class VideoStatus(str, Enum):
-    """视频任务状态"""
-    QUEUED = "queued"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    FAILED = "failed"
+# 视频任务状态
+VideoStatus = Literal["queued", "in_progress", "completed", "failed"]
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+FAILED = "failed"
 
+# 视频尺寸
+VideoSize = Literal["720x1280", "1280x720", "1024x1792", "1792x1024"]
 
-class VideoSize(str, Enum):
-    """视频尺寸"""
-    PORTRAIT_720 = "720x1280"
-    LANDSCAPE_720 = "1280x720"
-    PORTRAIT_1024 = "1024x1792"
-    LANDSCAPE_1024 = "1792x1024"
+# 视频时长
+VideoSeconds = Literal["4", "8", "12"]
 
+# 请求中的尺寸/时长（由校验器正则直接拒绝非法值）
+VideoSizeStr = Annotated[str, StringConstraints(pattern=r"^(?:720x1280|1280x720|1024x1792|1792x1024)$")]
+VideoSecondsStr = Annotated[str, StringConstraints(pattern=r"^(?:4|8|12)$")]
 
-class VideoSeconds(str, Enum):
-    """视频时长"""
-    FOUR = "4"
-    EIGHT = "8"
-    TWELVE = "12"
+# 视频模型
+VideoModel = Literal["sora-2", "sora-2-pro", "grok-imagine-0.9"]
 
 
-class VideoModel(str, Enum):
-    """视频模型"""
-    SORA_2 = "sora-2"
-    SORA_2_PRO = "sora-2-pro"
-    GROK_IMAGINE = "grok-imagine-0.9"
+# 模型配置：内部可信数据，不做赋值校验和实例重校验
+MODEL_CONFIG = ConfigDict(
+    extra="ignore",
+    defer_build=False,
+    validate_assignment=False,
+    revalidate_instances="never",
+    str_strip_whitespace=False,
+)
+
+# 提示词最大长度
+MAX_PROMPT_LENGTH = 8000
+
+# 参考图片（URL或base64）最大长度
+MAX_INPUT_REFERENCE_LENGTH = 10_000_000
 
 
 # === 请求模型 ===
 
 class CreateVideoRequest(BaseModel):
     """创建视频请求"""
-    prompt: str = Field(..., description="描述视频内容的文本提示", min_length=1, max_length=32000)
+    model_config = MODEL_CONFIG
+
+    prompt: str = Field(..., description="描述视频内容的文本提示", min_length=1, max_length=MAX_PROMPT_LENGTH)
     model: str = Field(default="sora-2", description="视频生成模型")
-    input_reference: Optional[str] = Field(default=None, description="可选的参考图片URL或base64")
-    seconds: Optional[str] = Field(default="4", description="视频时长（秒）")
-    size: Optional[str] = Field(default="720x1280", description="输出分辨率")
+    input_reference: Optional[str] = Field(default=None, description="可选的参考图片URL或base64", max_length=MAX_INPUT_REFERENCE_LENGTH)
+    seconds: Optional[VideoSecondsStr] = Field(default="4", description="视频时长（秒）")
+    size: Optional[VideoSizeStr] = Field(default="720x1280", description="输出分辨率")
     user: Optional[str] = Field(default=None, description="用户标识")
 
 
 class RemixVideoRequest(BaseModel):
     """视频混剪请求"""
-    prompt: str = Field(..., description="混剪提示词", min_length=1, max_length=32000)
+    model_config = MODEL_CONFIG
+
+    prompt: str = Field(..., description="混剪提示词", min_length=1, max_length=MAX_PROMPT_LENGTH)
 
 
 class ListVideosRequest(BaseModel):
     """列出视频请求参数"""
+    model_config = MODEL_CONFIG
+
     after: Optional[str] = Field(default=None, description="分页游标")
     limit: Optional[int] = Field(default=20, ge=1, le=100, description="返回数量")
     order: Optional[str] = Field(default="desc", description="排序方式 asc/desc")
@@ -63,12 +75,16 @@ class ListVideosRequest(BaseModel):
 
 class VideoError(BaseModel):
     """视频错误信息"""
+    model_config = MODEL_CONFIG
+
     code: str = Field(..., description="错误代码")
     message: str = Field(..., description="错误信息")
 
 
 class VideoJob(BaseModel):
     """视频任务对象"""
+    model_config = MODEL_CONFIG
+
     id: str = Field(..., description="视频任务ID")
     object: str = Field(default="video", description="对象类型")
     model: str = Field(..., description="使用的模型")
@@ -78,8 +94,8 @@ class VideoJob(BaseModel):
     completed_at: Optional[int] = Field(default=None, description="完成时间戳（秒）")
     expires_at: Optional[int] = Field(default=None, description="过期时间戳（秒）")
     prompt: Optional[str] = Field(default=None, description="生成提示词")
-    size: Optional[str] = Field(default=None, description="视频尺寸")
-    seconds: Optional[str] = Field(default=None, description="视频时长")
+    size: Optional[VideoSize] = Field(default=None, description="视频尺寸")
+    seconds: Optional[VideoSeconds] = Field(default=None, description="视频时长")
     quality: Optional[str] = Field(default="standard", description="视频质量")
     error: Optional[VideoError] = Field(default=None, description="错误信息")
     remixed_from_video_id: Optional[str] = Field(default=None, description="混剪源视频ID")
@@ -91,6 +107,8 @@ class VideoJob(BaseModel):
 
 class VideoListResponse(BaseModel):
     """视频列表响应"""
+    model_config = MODEL_CONFIG
+
     object: str = Field(default="list", description="对象类型")
     data: List[VideoJob] = Field(default_factory=list, description="视频任务列表")
     has_more: bool = Field(default=False, description="是否有更多数据")
@@ -100,6 +118,8 @@ class VideoListResponse(BaseModel):
 
 class VideoDeleteResponse(BaseModel):
     """视频删除响应"""
+    model_config = MODEL_CONFIG
+
     id: str = Field(..., description="删除的视频ID")
     object: str = Field(default="video", description="对象类型")
     deleted: bool = Field(default=True, description="是否已删除")
@@ -1,9 +1,12 @@
 """缓存服务模块 - 提供图片和视频的下载、缓存和清理功能"""
 
+import os
+import time
 import asyncio
 import base64
+import aiofiles
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Dict, Optional, Tuple
 from curl_cffi.requests import AsyncSession
 
 from app.core.config import setting
@@ -18,6 +21,8 @@ MIME_TYPES = {
 }
 DEFAULT_MIME = 'image/jpeg'
 ASSETS_URL = "https://assets.grok.com"
+REMOTE_MAX_CLIENTS = 50  # 远程视频拉取的共享会话并发连接数
+FILL_STALE_SECONDS = 600  # 回填超过该时长视为已中断（流未被消费时不会执行清理）
 
 
 class CacheService:
@@ -233,11 +238,90 @@ class VideoCache(CacheService):
 
     def __init__(self):
         super().__init__("video", timeout=60.0)
+        self._fills: Dict[str, float] = {}  # 正在回填的视频 -> 开始时间
+        self._session: Optional[AsyncSession] = None
+
+    def _get_session(self) -> AsyncSession:
+        """获取共享会话（复用连接，避免每次拉取都重新握手）"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.loop is not loop:
+            self._session = AsyncSession(loop=loop, max_clients=REMOTE_MAX_CLIENTS, impersonate="chrome133a")
+        return self._session
+
+    async def close(self) -> None:
+        """关闭共享会话"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def download_video(self, path: str, token: str) -> Optional[Path]:
         """下载视频"""
         return await self.download(path, token)
 
+    async def stream_remote(self, url: str, file_path: str, auth_token: str) -> Optional[Tuple[AsyncIterator[bytes], Optional[str]]]:
+        """打开远程视频流，边转发边写入本地缓存
+
+        同一视频同时只拉取一次上游，其他请求在回填期间得到 None（由调用方重定向）。
+
+        Returns:
+            (字节迭代器, Content-Length) 元组；上游不可用或正在回填时返回 None
+        """
+        now = time.monotonic()
+        started = self._fills.get(file_path)
+        if started is not None and now - started < FILL_STALE_SECONDS:
+            self._log("debug", "远程视频正在缓存，跳过重复拉取")
+            return None
+        self._fills[file_path] = now
+
+        try:
+            proxy = await setting.get_proxy_async("cache")
+            response = await self._get_session().get(
+                url,
+                headers=self._build_headers(file_path, auth_token),
+                proxies={"http": proxy, "https": proxy} if proxy else {},
+                timeout=self.timeout,
+                allow_redirects=True,
+                stream=True
+            )
+            if response.status_code != 200:
+                self._log("warning", f"远程视频不可用: {response.status_code}")
+                self._release_fill(file_path, now)
+                await response.aclose()
+                return None
+        except Exception as e:
+            self._log("warning", f"打开远程视频失败: {e}")
+            self._release_fill(file_path, now)
+            return None
+
+        return self._relay(response, file_path, now), response.headers.get("content-length")
+
+    def _release_fill(self, file_path: str, started: float) -> None:
+        """结束回填标记（仅移除本次拉取登记的标记）"""
+        if self._fills.get(file_path) == started:
+            del self._fills[file_path]
+
+    async def _relay(self, response, file_path: str, started: float) -> AsyncIterator[bytes]:
+        """转发上游数据并写入缓存"""
+        cache_path = self._get_path(file_path)
+        tmp_path = cache_path.with_suffix(cache_path.suffix + ".part")
+        completed = False
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in response.aiter_content():
+                    await f.write(chunk)
+                    yield chunk
+            await asyncio.to_thread(os.replace, tmp_path, cache_path)
+            completed = True
+            self._log("debug", "远程视频已缓存")
+            asyncio.create_task(self._safe_cleanup())
+        finally:
+            self._release_fill(file_path, started)
+            try:
+                if not completed:
+                    await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            finally:
+                await response.aclose()
+
 
 # 全局实例
 image_cache_service = ImageCache()
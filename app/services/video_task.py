@@ -1,23 +1,43 @@
 """视频任务服务 - 管理视频生成任务的创建、查询和状态跟踪"""
 
-import uuid
+import os
+import re
+import secrets
 import time
+import heapq
+import bisect
 import asyncio
 import orjson
 import aiofiles
 from pathlib import Path
-from dataclasses import dataclass, asdict, field
-from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Dict, Any, FrozenSet, List, Optional, Set, Tuple
 from enum import Enum
 
 from app.core.logger import logger
 from app.core.config import setting
+from app.core.fs import run_fs
+from app.core.task_cache import task_cache
 from app.services.grok.token import token_manager
 from app.services.grok.client import GrokClient
 from app.services.grok.cache import video_cache_service
 from app.services.call_log import call_log_service
 
 
+# 常量
+_VIDEO_SRC_RE = re.compile(r'<video[^>]+src="([^"]+)"')
+_VIDEO_EXTS = (".mp4", ".webm", ".mov")
+_OPENAI_MODEL_MAP = {
+    "grok-imagine-0.9": "sora-2",  # 对外显示为sora-2
+}
+_GROK_MODEL_MAP = {
+    "sora-2": "grok-imagine-0.9",
+    "sora-2-pro": "grok-imagine-0.9",
+    "sora": "grok-imagine-0.9",
+}
+
+
 class VideoTaskStatus(str, Enum):
     """视频任务状态"""
     QUEUED = "queued"
@@ -26,10 +46,13 @@ class VideoTaskStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+_TERMINAL_STATUSES = frozenset({VideoTaskStatus.COMPLETED.value, VideoTaskStatus.FAILED.value})
+
+
+@dataclass(slots=True)
 class VideoTask:
     """视频任务数据模型"""
-    id: str = field(default_factory=lambda: f"video_{uuid.uuid4().hex[:12]}")
+    id: str = field(default_factory=lambda: f"video_{secrets.token_hex(6)}")
     model: str = "grok-imagine-0.9"
     status: str = "queued"
     progress: int = 0
@@ -49,20 +72,49 @@ class VideoTask:
     input_reference: Optional[str] = None
     sso_token: Optional[str] = None
     user: Optional[str] = None
+    # 终态任务的OpenAI格式响应缓存（不持久化）
+    _cached_response: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    _FIELDS: ClassVar[FrozenSet[str]]
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return asdict(self)
+        """转换为字典（字段均为基本类型，直接构造避免 asdict 的递归拷贝）"""
+        return {
+            "id": self.id,
+            "model": self.model,
+            "status": self.status,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+            "expires_at": self.expires_at,
+            "prompt": self.prompt,
+            "size": self.size,
+            "seconds": self.seconds,
+            "quality": self.quality,
+            "error_code": self.error_code,
+            "error_message": self.error_message,
+            "remixed_from_video_id": self.remixed_from_video_id,
+            "video_url": self.video_url,
+            "video_path": self.video_path,
+            "thumbnail_url": self.thumbnail_url,
+            "input_reference": self.input_reference,
+            "sso_token": self.sso_token,
+            "user": self.user,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'VideoTask':
         """从字典创建"""
-        valid_fields = {k for k in cls.__dataclass_fields__}
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-        return cls(**filtered_data)
+        return cls(**{k: v for k, v in data.items() if k in cls._FIELDS})
     
     def to_openai_response(self) -> Dict[str, Any]:
-        """转换为OpenAI格式响应"""
+        """转换为OpenAI格式响应（固定键集合，与 VideoJob 字段一致）
+        
+        终态任务不再变化，响应缓存在实例上复用，调用方不应修改返回值。
+        """
+        if self._cached_response is not None:
+            return self._cached_response
+        
         response = {
             "id": self.id,
             "object": "video",
@@ -70,37 +122,30 @@ class VideoTask:
             "status": self.status,
             "progress": self.progress,
             "created_at": self.created_at,
+            "completed_at": self.completed_at or None,
+            "expires_at": self.expires_at or None,
+            "prompt": self.prompt or None,
             "size": self.size,
             "seconds": self.seconds,
             "quality": self.quality,
-        }
-        
-        if self.prompt:
-            response["prompt"] = self.prompt
-        if self.completed_at:
-            response["completed_at"] = self.completed_at
-        if self.expires_at:
-            response["expires_at"] = self.expires_at
-        if self.error_code or self.error_message:
-            response["error"] = {
+            "error": {
                 "code": self.error_code or "unknown_error",
                 "message": self.error_message or "Unknown error occurred"
-            }
-        if self.remixed_from_video_id:
-            response["remixed_from_video_id"] = self.remixed_from_video_id
-        if self.video_url:
-            response["video_url"] = self.video_url
-        if self.thumbnail_url:
-            response["thumbnail_url"] = self.thumbnail_url
-            
+            } if self.error_code or self.error_message else None,
+            "remixed_from_video_id": self.remixed_from_video_id or None,
+            "video_url": self.video_url or None,
+            "thumbnail_url": self.thumbnail_url or None,
+        }
+        if self.status in _TERMINAL_STATUSES:
+            self._cached_response = response
         return response
     
     def _map_model_name(self) -> str:
         """映射模型名称为OpenAI风格"""
-        model_map = {
-            "grok-imagine-0.9": "sora-2",  # 对外显示为sora-2
-        }
-        return model_map.get(self.model, self.model)
+        return _OPENAI_MODEL_MAP.get(self.model, self.model)
+
+
+VideoTask._FIELDS = frozenset(f.name for f in fields(VideoTask) if f.init)
 
 
 class VideoTaskService:
@@ -111,19 +156,34 @@ class VideoTaskService:
     def __new__(cls) -> 'VideoTaskService':
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
         return cls._instance
     
     def __init__(self):
-        if hasattr(self, '_initialized'):
+        if self._initialized:
             return
         
         self.task_file = Path(__file__).parents[2] / "data" / "video_tasks.json"
+        self.journal_file = self.task_file.with_suffix(".jsonl")
         self.task_file.parent.mkdir(parents=True, exist_ok=True)
         self._lock = asyncio.Lock()
         self._tasks: Dict[str, VideoTask] = {}
+        # 按 (创建时间, ID) 升序维护的索引，列表分页直接二分定位
+        # 排序键为 (创建时间, 插入序号, ID)，同一秒内按创建顺序排列
+        self._by_time: List[Tuple[int, int, str]] = []
+        self._by_user: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        # 过期时间最小堆 (expires_at, ID)，已删除任务的条目在弹出时惰性丢弃
+        self._expiry_heap: List[Tuple[int, str]] = []
         self._loaded = False
-        self._save_pending = False
+        self._dirty_ids: Set[str] = set()
+        self._dirty_event = asyncio.Event()
+        self._journal_lines = 0
+        self._compact_threshold = 500  # 变更日志超过该行数后压缩为快照
         self._save_task: Optional[asyncio.Task] = None
+        self._log_queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=4096)
+        self._log_task: Optional[asyncio.Task] = None
         self._shutdown = False
         self._max_tasks = 1000  # 最大任务数
         self._task_expire_hours = 24  # 任务过期时间（小时）
@@ -132,63 +192,200 @@ class VideoTaskService:
         logger.debug(f"[VideoTask] 初始化完成: {self.task_file}")
     
     async def _load_tasks(self) -> None:
-        """加载任务数据"""
+        """加载任务数据（快照 + 变更日志回放）"""
         if self._loaded:
             return
         
         try:
             if self.task_file.exists():
-                async with aiofiles.open(self.task_file, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    data = orjson.loads(content)
-                    for task_id, task_data in data.get("tasks", {}).items():
-                        self._tasks[task_id] = VideoTask.from_dict(task_data)
-                    logger.info(f"[VideoTask] 加载 {len(self._tasks)} 个任务")
+                # orjson 直接解析 bytes，省去 utf-8 解码再编码
+                content = await asyncio.to_thread(self.task_file.read_bytes)
+                data = orjson.loads(content)
+                for task_id, task_data in data.get("tasks", {}).items():
+                    self._tasks[task_id] = VideoTask.from_dict(task_data)
             else:
                 self._tasks = {}
                 logger.debug("[VideoTask] 任务文件不存在，创建空列表")
+            
+            damaged = False
+            if self.journal_file.exists():
+                damaged = await self._replay_journal()
+            
+            self._rebuild_index()
+            logger.info(f"[VideoTask] 加载 {len(self._tasks)} 个任务")
             self._loaded = True
+            
+            # 日志尾部残缺时立即压缩，避免后续追加的记录接在残缺行之后
+            if damaged:
+                await self._save_tasks()
         except Exception as e:
             logger.error(f"[VideoTask] 加载任务失败: {e}")
             self._tasks = {}
+            self._rebuild_index()
             self._loaded = True
     
+    async def _replay_journal(self) -> bool:
+        """按顺序回放变更日志
+        
+        Returns:
+            日志是否存在损坏或未以换行结尾（写入中断）
+        """
+        content = await asyncio.to_thread(self.journal_file.read_bytes)
+        damaged = bool(content) and not content.endswith(b"\n")
+        
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # 写入中断导致的残缺行
+                logger.warning("[VideoTask] 跳过损坏的变更日志行")
+                damaged = True
+                continue
+            
+            if record.get("_deleted"):
+                self._tasks.pop(record["id"], None)
+            else:
+                self._tasks[record["id"]] = VideoTask.from_dict(record)
+            self._journal_lines += 1
+        
+        return damaged
+    
     async def _save_tasks(self) -> None:
-        """保存任务数据"""
+        """写入完整快照并清空变更日志（压缩）"""
         try:
+            # 锁内只做浅拷贝，序列化与写盘在锁外进行，不阻塞任务创建
             async with self._lock:
-                data = {
-                    "tasks": {task_id: task.to_dict() for task_id, task in self._tasks.items()},
-                    "meta": {
-                        "total_count": len(self._tasks),
-                        "last_save": int(time.time())
-                    }
-                }
-                content = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
-                async with aiofiles.open(self.task_file, "w", encoding="utf-8") as f:
-                    await f.write(content)
-                logger.debug(f"[VideoTask] 保存 {len(self._tasks)} 个任务")
+                snapshot = dict(self._tasks)
+            
+            # 字段在事件循环内取出，保证单个任务的状态一致
+            tasks = {task_id: task.to_dict() for task_id, task in snapshot.items()}
+            await asyncio.to_thread(self._blocking_save, tasks)
+            self._journal_lines = 0
+            logger.debug(f"[VideoTask] 保存 {len(tasks)} 个任务")
         except Exception as e:
             logger.error(f"[VideoTask] 保存任务失败: {e}")
     
-    def _mark_dirty(self) -> None:
-        """标记有待保存的数据"""
-        self._save_pending = True
+    def _blocking_save(self, tasks: Dict[str, Dict[str, Any]]) -> None:
+        """线程内序列化并原子替换快照文件，随后清空变更日志"""
+        data = orjson.dumps({
+            "tasks": tasks,
+            "meta": {
+                "total_count": len(tasks),
+                "last_save": int(time.time())
+            }
+        })
+        tmp_path = self.task_file.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.task_file)
+        # 快照落盘后再清空日志，保证任一时刻快照+日志可恢复完整状态
+        with open(self.journal_file, "wb"):
+            pass
+    
+    async def _flush_journal(self) -> None:
+        """将变更任务追加到日志，行数超限时压缩"""
+        dirty, self._dirty_ids = self._dirty_ids, set()
+        lines = []
+        for task_id in dirty:
+            task = self._tasks.get(task_id)
+            record = task.to_dict() if task else {"id": task_id, "_deleted": True}
+            lines.append(orjson.dumps(record))
+        
+        try:
+            async with aiofiles.open(self.journal_file, "ab") as f:
+                await f.write(b"\n".join(lines) + b"\n")
+        except BaseException:
+            # 含取消：未确认写入的任务重新标记，重复追加在回放时幂等
+            self._dirty_ids |= dirty
+            raise
+        
+        self._journal_lines += len(lines)
+        logger.debug(f"[VideoTask] 追加 {len(lines)} 条变更")
+        
+        if self._journal_lines >= self._compact_threshold:
+            await self._save_tasks()
+    
+    def _rebuild_index(self) -> None:
+        """根据任务字典重建排序索引（字典顺序即快照与日志中的创建顺序）"""
+        self._seq = {task_id: i for i, task_id in enumerate(self._tasks)}
+        self._next_seq = len(self._seq)
+        self._by_time = sorted(self._sort_key(t) for t in self._tasks.values())
+        self._by_user = {}
+        for key in self._by_time:
+            user = self._tasks[key[2]].user
+            if user:
+                self._by_user.setdefault(user, []).append(key)
+        self._expiry_heap = [(t.expires_at, t.id) for t in self._tasks.values() if t.expires_at]
+        heapq.heapify(self._expiry_heap)
+    
+    def _sort_key(self, task: VideoTask) -> Tuple[int, int, str]:
+        """任务在排序索引中的键"""
+        return task.created_at, self._seq[task.id], task.id
+    
+    def _index_add(self, task: VideoTask) -> None:
+        """将任务加入排序索引"""
+        self._seq[task.id] = self._next_seq
+        self._next_seq += 1
+        key = self._sort_key(task)
+        bisect.insort(self._by_time, key)
+        if task.user:
+            bisect.insort(self._by_user.setdefault(task.user, []), key)
+        if task.expires_at:
+            heapq.heappush(self._expiry_heap, (task.expires_at, task.id))
+    
+    def _index_remove(self, task: VideoTask) -> None:
+        """从排序索引移除任务"""
+        if task.id not in self._seq:
+            return
+        key = self._sort_key(task)
+        del self._seq[task.id]
+        lists = [self._by_time]
+        if task.user and task.user in self._by_user:
+            lists.append(self._by_user[task.user])
+        for keys in lists:
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                keys.pop(i)
+        if task.user and not self._by_user.get(task.user, True):
+            del self._by_user[task.user]
+    
+    def _mark_dirty(self, task_id: str) -> None:
+        """标记任务有待保存"""
+        self._dirty_ids.add(task_id)
+        self._dirty_event.set()
     
     async def _batch_save_worker(self) -> None:
-        """批量保存后台任务"""
-        interval = 2.0
-        logger.info(f"[VideoTask] 存储任务已启动，间隔: {interval}s")
+        """批量保存后台任务（有变更时唤醒，合并窗口内的变更一次写入）"""
+        window = 0.5
+        cleanup_interval = 60.0
+        logger.info(f"[VideoTask] 存储任务已启动，合并窗口: {window}s")
         
         while not self._shutdown:
-            await asyncio.sleep(interval)
+            try:
+                await asyncio.wait_for(self._dirty_event.wait(), timeout=cleanup_interval)
+            except asyncio.TimeoutError:
+                pass
+            
+            if self._expiry_heap and not self._shutdown:
+                async with self._lock:
+                    await self._cleanup_old_tasks()
+            
+            if not self._dirty_event.is_set() or self._shutdown:
+                continue
             
-            if self._save_pending and not self._shutdown:
+            await asyncio.sleep(window)
+            self._dirty_event.clear()
+            if self._dirty_ids and not self._shutdown:
                 try:
-                    await self._save_tasks()
-                    self._save_pending = False
+                    await self._flush_journal()
                 except Exception as e:
                     logger.error(f"[VideoTask] 存储失败: {e}")
+                    await asyncio.sleep(2.0)
+                    self._dirty_event.set()
     
     async def start(self) -> None:
         """启动服务"""
@@ -196,20 +393,52 @@ class VideoTaskService:
         if self._save_task is None:
             self._save_task = asyncio.create_task(self._batch_save_worker())
             logger.info("[VideoTask] 服务已启动")
+        if self._log_task is None:
+            self._log_task = asyncio.create_task(self._log_worker())
+    
+    async def _log_worker(self) -> None:
+        """调用日志后台任务（单消费者串行写入）"""
+        while True:
+            item = await self._log_queue.get()
+            try:
+                await call_log_service.record_call(**item)
+            except Exception as e:
+                logger.error(f"[VideoTask] 记录调用日志失败: {e}")
+    
+    def _enqueue_log(self, **item: Any) -> None:
+        """提交调用日志，队列满时丢弃"""
+        try:
+            self._log_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            logger.warning("[VideoTask] 调用日志队列已满，丢弃记录")
     
     async def shutdown(self) -> None:
         """关闭服务"""
         self._shutdown = True
         
+        # 协作式停止存储任务：唤醒后等待其退出，不取消正在线程中进行的写盘，
+        # 避免与下方的最终保存同时写同一个临时文件
         if self._save_task:
-            self._save_task.cancel()
+            self._dirty_event.set()
+            await self._save_task
+        
+        if self._log_task:
+            self._log_task.cancel()
             try:
-                await self._save_task
+                await self._log_task
             except asyncio.CancelledError:
                 pass
         
-        if self._save_pending:
+        # 写入队列中剩余的调用日志
+        while not self._log_queue.empty():
+            try:
+                await call_log_service.record_call(**self._log_queue.get_nowait())
+            except Exception as e:
+                logger.error(f"[VideoTask] 记录调用日志失败: {e}")
+        
+        if self._dirty_ids or self._journal_lines:
             await self._save_tasks()
+            self._dirty_ids.clear()
             logger.info("[VideoTask] 关闭时保存完成")
     
     async def create_task(
@@ -241,14 +470,16 @@ class VideoTaskService:
             user=user
         )
         
-        async with self._lock:
-            self._tasks[task.id] = task
-            
-            # 自动清理超限任务
-            if len(self._tasks) > self._max_tasks:
+        # 单次插入在事件循环内天然原子，无需加锁
+        self._tasks[task.id] = task
+        self._index_add(task)
+        
+        # 自动清理超限任务
+        if len(self._tasks) > self._max_tasks:
+            async with self._lock:
                 await self._cleanup_old_tasks()
         
-        self._mark_dirty()
+        self._mark_dirty(task.id)
         logger.info(f"[VideoTask] 创建任务: {task.id}, prompt={prompt[:50]}...")
         
         # 异步启动视频生成
@@ -270,8 +501,10 @@ class VideoTaskService:
         try:
             # 更新状态为进行中
             task.status = VideoTaskStatus.IN_PROGRESS.value
+            task._cached_response = None
             task.progress = 10
-            self._mark_dirty()
+            self._mark_dirty(task_id)
+            await task_cache.delete(task_id)
             
             # 构建消息
             messages = [{"role": "user", "content": []}]
@@ -302,14 +535,12 @@ class VideoTaskService:
             
             # 更新进度
             task.progress = 30
-            self._mark_dirty()
             
             # 调用Grok客户端
             logger.info(f"[VideoTask] 开始生成: {task_id}")
             result = await GrokClient.openai_to_grok(request)
             
             task.progress = 80
-            self._mark_dirty()
             
             # 解析结果
             if isinstance(result, tuple):
@@ -328,16 +559,14 @@ class VideoTaskService:
                 content = response['choices'][0]['message']['content']
             
             # 从content中提取视频URL
-            import re
-            video_pattern = r'<video[^>]+src="([^"]+)"'
-            video_matches = re.findall(video_pattern, content)
-            if video_matches:
-                video_url = video_matches[0]
+            match = _VIDEO_SRC_RE.search(content)
+            if match:
+                video_url = match.group(1)
             
-            # 或从media_urls中获取
+            # 或从media_urls中获取（按扩展名判断，忽略查询参数）
             if not video_url and media_urls:
                 for url in media_urls:
-                    if any(ext in url.lower() for ext in ['.mp4', '.webm', '.mov']):
+                    if url.split("?", 1)[0].lower().endswith(_VIDEO_EXTS):
                         video_url = url
                         break
             
@@ -355,7 +584,7 @@ class VideoTaskService:
                 
                 # 记录成功日志
                 response_time = time.time() - start_time
-                asyncio.create_task(call_log_service.record_call(
+                self._enqueue_log(
                     sso=sso_token,
                     model=task.model,
                     success=True,
@@ -363,7 +592,7 @@ class VideoTaskService:
                     response_time=response_time,
                     proxy_used=proxy_used,
                     media_urls=[video_url]
-                ))
+                )
             else:
                 task.status = VideoTaskStatus.FAILED.value
                 task.error_code = "no_video_generated"
@@ -378,7 +607,7 @@ class VideoTaskService:
             
             # 记录失败日志
             response_time = time.time() - start_time
-            asyncio.create_task(call_log_service.record_call(
+            self._enqueue_log(
                 sso=sso_token,
                 model=task.model,
                 success=False,
@@ -386,10 +615,12 @@ class VideoTaskService:
                 response_time=response_time,
                 error_message=str(e),
                 proxy_used=proxy_used
-            ))
+            )
         
         finally:
-            self._mark_dirty()
+            task._cached_response = None
+            self._mark_dirty(task_id)
+            await task_cache.delete(task_id)
     
     async def get_task(self, task_id: str) -> Optional[VideoTask]:
         """获取任务"""
@@ -412,49 +643,72 @@ class VideoTaskService:
         if not self._loaded:
             await self._load_tasks()
         
-        # 获取所有任务
-        tasks = list(self._tasks.values())
-        
-        # 过滤用户
-        if user:
-            tasks = [t for t in tasks if t.user == user]
-        
-        # 按创建时间排序
-        reverse = order.lower() == "desc"
-        tasks.sort(key=lambda t: t.created_at, reverse=reverse)
+        # 按 (创建时间, 插入序号) 升序的索引，同一秒内创建的任务保持创建顺序
+        keys = self._by_user.get(user, []) if user else self._by_time
         
-        # 分页
-        if after:
-            found = False
-            filtered = []
-            for t in tasks:
-                if found:
-                    filtered.append(t)
-                elif t.id == after:
-                    found = True
-            tasks = filtered
+        # 键集分页：游标ID解析为排序键后二分定位，多取一条判断是否还有更多
+        anchor = self._tasks.get(after) if after else None
+        if after and anchor is None:
+            window = []
+        elif order.lower() == "desc":
+            end = bisect.bisect_left(keys, self._sort_key(anchor)) if anchor else len(keys)
+            window = keys[max(0, end - limit - 1):end][::-1]
+        else:
+            start = bisect.bisect_right(keys, self._sort_key(anchor)) if anchor else 0
+            window = keys[start:start + limit + 1]
         
         # 限制数量
-        has_more = len(tasks) > limit
-        tasks = tasks[:limit]
+        has_more = len(window) > limit
+        tasks = [self._tasks[task_id] for _, _, task_id in window[:limit]]
         
         first_id = tasks[0].id if tasks else None
         last_id = tasks[-1].id if tasks else None
         
         return tasks, has_more, first_id, last_id
     
-    async def delete_task(self, task_id: str) -> Optional[VideoTask]:
-        """删除任务"""
+    async def list_openai_dicts(
+        self,
+        limit: int = 20,
+        after: Optional[str] = None,
+        order: str = "desc",
+        user: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], bool, Optional[str], Optional[str]]:
+        """列出任务（直接返回OpenAI格式字典）
+        
+        Returns:
+            (响应字典列表, 是否有更多, 首个ID, 最后ID)
+        """
+        tasks, has_more, first_id, last_id = await self.list_tasks(limit, after, order, user)
+        return [t.to_openai_response() for t in tasks], has_more, first_id, last_id
+    
+    async def mark_deleted(self, task_id: str) -> Optional[VideoTask]:
+        """删除任务记录（不清理文件，资源由 purge_assets 异步清理）"""
         if not self._loaded:
             await self._load_tasks()
         
         task = self._tasks.pop(task_id, None)
+        await task_cache.delete(task_id)
         if task:
-            self._mark_dirty()
+            self._index_remove(task)
+            self._mark_dirty(task_id)
             logger.info(f"[VideoTask] 删除任务: {task_id}")
         
         return task
     
+    async def purge_assets(self, task: VideoTask) -> None:
+        """清理已删除任务的本地视频缓存"""
+        original_path = self._cache_key(task)
+        if not original_path:
+            return
+        
+        try:
+            cache_path = await run_fs(video_cache_service.get_cached, original_path)
+            if cache_path:
+                await run_fs(cache_path.unlink, missing_ok=True)
+                logger.debug(f"[VideoTask] 清理视频缓存: {task.id}")
+        except Exception as e:
+            logger.warning(f"[VideoTask] 清理视频缓存失败: {task.id}, {e}")
+    
     async def remix_task(
         self,
         source_task_id: str,
@@ -479,7 +733,7 @@ class VideoTaskService:
         )
         
         new_task.remixed_from_video_id = source_task_id
-        self._mark_dirty()
+        self._mark_dirty(new_task.id)
         
         return new_task
     
@@ -490,37 +744,63 @@ class VideoTaskService:
             return None
         
         # 尝试从缓存获取
-        if task.video_path:
-            original_path = "/" + task.video_path.replace('-', '/')
-            cache_path = video_cache_service.get_cached(original_path)
-            if cache_path and cache_path.exists():
-                return cache_path
+        original_path = self._cache_key(task)
+        if original_path:
+            return await run_fs(video_cache_service.get_cached, original_path)
         
         return None
     
+    def get_remote_source(self, task: VideoTask) -> Optional[Tuple[str, str]]:
+        """获取可由服务端代理拉取的远程视频
+        
+        Returns:
+            (远程URL, 缓存路径) 元组；视频URL指向本服务缓存时返回 None
+        """
+        url = task.video_url
+        if not url or not url.startswith(("http://", "https://")) or '/images/' in url:
+            return None
+        return url, urlparse(url).path
+    
+    def get_remote_auth(self, task: VideoTask) -> Optional[str]:
+        """获取拉取远程视频的认证Cookie（优先使用任务记录的SSO，否则从Token池选择）"""
+        if task.sso_token:
+            return f"sso-rw={task.sso_token};sso={task.sso_token}"
+        try:
+            return token_manager.get_token(task.model)
+        except Exception as e:
+            logger.warning(f"[VideoTask] 无可用Token拉取远程视频: {e}")
+            return None
+    
+    def _cache_key(self, task: VideoTask) -> Optional[str]:
+        """任务视频对应的缓存路径"""
+        if task.video_path:
+            return "/" + task.video_path.replace('-', '/')
+        if source := self.get_remote_source(task):
+            return source[1]
+        return None
+    
     async def _cleanup_old_tasks(self) -> None:
         """清理过期任务"""
         now = int(time.time())
+        heap = self._expiry_heap
         expired_ids = []
         
-        for task_id, task in self._tasks.items():
-            if task.expires_at and task.expires_at < now:
-                expired_ids.append(task_id)
-        
-        for task_id in expired_ids:
+        while heap and heap[0][0] < now:
+            expires_at, task_id = heapq.heappop(heap)
+            task = self._tasks.get(task_id)
+            if task is None or task.expires_at != expires_at:
+                continue
             del self._tasks[task_id]
+            self._index_remove(task)
+            self._mark_dirty(task_id)
+            expired_ids.append(task_id)
         
         if expired_ids:
             logger.info(f"[VideoTask] 清理 {len(expired_ids)} 个过期任务")
     
     def _map_to_grok_model(self, model: str) -> str:
         """将OpenAI模型名映射到Grok模型"""
-        model_map = {
-            "sora-2": "grok-imagine-0.9",
-            "sora-2-pro": "grok-imagine-0.9",
-            "sora": "grok-imagine-0.9",
-        }
-        return model_map.get(model.lower(), "grok-imagine-0.9")
+        return _GROK_MODEL_MAP.get(model.lower(), "grok-imagine-0.9")
 
 
 # 全局实例
@@ -2,15 +2,19 @@
 
 import os
 import sys
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.core.logger import logger
 from app.core.exception import register_exception_handlers
 from app.core.storage import storage_manager
+from app.core.task_cache import task_cache
 from app.core.config import setting
 from app.services.grok.token import token_manager
 from app.services.call_log import call_log_service
@@ -21,6 +25,7 @@ from app.api.v1.videos import router as videos_router
 from app.api.admin.manage import router as admin_router
 from app.services.mcp import mcp
 from app.services.video_task import video_task_service
+from app.services.grok.cache import video_cache_service
 
 # 0. 兼容性检测
 try:
@@ -59,11 +64,16 @@ async def lifespan(app: FastAPI):
     storage = storage_manager.get_storage()
     setting.set_storage(storage)
     token_manager.set_storage(storage)
+    task_cache.set_storage(storage)
     
     # 2. 重新加载配置
     await setting.reload()
     logger.info("[Grok2API] 核心服务初始化完成")
     
+    # 2.1 扩大默认线程池（文件下载等阻塞调用使用 asyncio.to_thread）
+    thread_pool_workers = setting.global_config.get("thread_pool_workers", 64)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=thread_pool_workers))
+    
     # 2.5. 初始化代理池
     from app.core.proxy_pool import proxy_pool
     proxy_url = setting.grok_config.get("proxy_url", "")
@@ -122,13 +132,14 @@ async def lifespan(app: FastAPI):
         await token_manager.shutdown()
         logger.info("[Token] Token管理器已关闭")
         
-        # 2.5. 关闭调用日志服务
-        await call_log_service.shutdown()
-        logger.info("[CallLog] 调用日志服务已关闭")
-        
-        # 2.6. 关闭视频任务服务
+        # 2.5. 关闭视频任务服务（先于调用日志服务，以便写入剩余调用日志）
         await video_task_service.shutdown()
         logger.info("[VideoTask] 视频任务服务已关闭")
+        await video_cache_service.close()
+        
+        # 2.6. 关闭调用日志服务
+        await call_log_service.shutdown()
+        logger.info("[CallLog] 调用日志服务已关闭")
         
         # 3. 关闭核心服务
         await storage_manager.close()
@@ -143,7 +154,8 @@ app = FastAPI(
     title="Grok2API",
     description="Grok2API（OpenAI 兼容接口）：将 Grok Web 调用适配为 OpenAI 风格 API，支持流式对话、图片/视频生成与缓存、代理池与 SSO 绑定、号池并发与自动负载均衡。",
     version="1.3.1",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # 注册全局异常处理器